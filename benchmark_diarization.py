@@ -0,0 +1,130 @@
+import time
+import numpy as np
+
+from diarization import GUEST, OFFICER, RATE, SpeakerDiarizer, new_segments_since
+
+SEGMENT_DURATION_SEC = 6
+OVERLAP_DURATION_SEC = 2
+STRIDE_SEC = SEGMENT_DURATION_SEC - OVERLAP_DURATION_SEC
+
+# Vowel formants (Hz) for an adult male vocal tract; other voices are scaled from these
+VOWELS = [(730, 1090, 2440), (270, 2290, 3010), (530, 1840, 2480), (570, 840, 2410), (300, 870, 2240)]
+
+# (mean pitch Hz, formant scale, breathiness)
+VOICES = {
+    OFFICER: (118.0, 1.0, 0.01),
+    GUEST: (205.0, 1.17, 0.02),
+}
+
+
+def synth_speech(rng, voice, seconds):
+    """Crude source-filter speech: harmonic syllables shaped by vowel formants, with pauses."""
+    f0_mean, formant_scale, noise = VOICES[voice]
+    out = []
+    total = 0
+    while total < seconds * RATE:
+        n = int(rng.uniform(0.12, 0.3) * RATE)
+        t = np.arange(n) / RATE
+        f0 = f0_mean * rng.uniform(0.85, 1.15) * (1 + 0.05 * np.sin(2 * np.pi * rng.uniform(1, 4) * t))
+        phase = 2 * np.pi * np.cumsum(f0) / RATE
+        formants = np.array(VOWELS[rng.integers(len(VOWELS))]) * formant_scale
+
+        syllable = np.zeros(n)
+        for k in range(1, int(4000 / f0_mean)):
+            freq = k * f0_mean
+            gain = sum(1.0 / (1 + ((freq - f) / (0.08 * f)) ** 2) for f in formants) / k ** 0.5
+            syllable += gain * np.sin(k * phase)
+        syllable *= np.hanning(n)
+        out.append(syllable)
+        total += n
+        if rng.random() < 0.2:
+            pause = int(rng.uniform(0.05, 0.2) * RATE)
+            out.append(np.zeros(pause))
+            total += pause
+
+    audio = np.concatenate(out)[: int(seconds * RATE)]
+    audio = 0.3 * audio / (np.abs(audio).max() + 1e-9)
+    return audio + noise * rng.standard_normal(len(audio))
+
+
+def synth_call(rng, seconds):
+    """Alternating officer/guest turns; returns PCM bytes and (start, end, speaker) turns in seconds."""
+    audio, turns, now, speaker = [], [], 0.0, OFFICER
+    while now < seconds:
+        length = rng.uniform(2.0, 8.0)
+        audio.append(synth_speech(rng, speaker, length))
+        turns.append((now, now + length, speaker))
+        now += length
+        speaker = GUEST if speaker == OFFICER else OFFICER
+    pcm = (np.clip(np.concatenate(audio), -1, 1) * 32767).astype("<i2").tobytes()
+    return pcm, turns
+
+
+def whisper_like_segments(turns, window_start, window_end):
+    """
+    One segment per speaker turn in the window, timed relative to the window like Whisper.
+
+    Segments are not length-capped, so a window with a single speaker yields one segment
+    spanning the whole window, including the overlap with the previous one.
+    """
+    segments = []
+    for start, end, speaker in turns:
+        start, end = max(start, window_start), min(end, window_end)
+        if end - start > 0.3:
+            segments.append({
+                "start": start - window_start,
+                "end": end - window_start,
+                "text": "...",
+                "truth": speaker,
+            })
+    return segments
+
+
+def run_session(seed, call_seconds):
+    rng = np.random.default_rng(seed)
+    pcm, turns = synth_call(rng, call_seconds)
+    total_seconds = len(pcm) / 2 / RATE
+
+    diarizer = SpeakerDiarizer()
+    correct = labeled_seconds = 0.0
+    window_start, previous_segments = 0.0, []
+    while window_start + SEGMENT_DURATION_SEC <= total_seconds:
+        window_end = window_start + SEGMENT_DURATION_SEC
+        window = pcm[int(window_start * RATE) * 2:int(window_end * RATE) * 2]
+        # Same overlap filtering as websocket_audio
+        current_segments = whisper_like_segments(turns, window_start, window_end)
+        segments = new_segments_since(previous_segments, current_segments, STRIDE_SEC)
+        for seg, result in zip(segments, diarizer.label_segments(window, segments)):
+            duration = seg["end"] - seg["start"]
+            labeled_seconds += duration
+            correct += duration if result["speaker"] == seg["truth"] else 0.0
+        previous_segments = current_segments
+        window_start += STRIDE_SEC
+
+    coverage = labeled_seconds / window_end if labeled_seconds else 0.0
+    return diarizer.stats(), correct / labeled_seconds if labeled_seconds else 0.0, coverage
+
+
+def main(sessions=10, call_seconds=180):
+    print(f"{sessions} synthetic calls of {call_seconds} s, {SEGMENT_DURATION_SEC} s windows\n")
+    accuracies, coverages, cpu, audio = [], [], [], []
+    started = time.perf_counter()
+    for seed in range(sessions):
+        stats, accuracy, coverage = run_session(seed, call_seconds)
+        accuracies.append(accuracy)
+        coverages.append(coverage)
+        cpu.append(stats["cpuSeconds"])
+        audio.append(stats["audioSeconds"])
+        print(
+            f"session {seed:>2}: accuracy {accuracy:6.1%}  coverage {coverage:6.1%}  cpu {stats['cpuSeconds']:.3f} s"
+            f"  for {stats['audioSeconds']:.0f} s audio  (RTF {stats['realTimeFactor']:.4f})"
+        )
+    print(f"\nmean accuracy:            {np.mean(accuracies):.1%}")
+    print(f"mean audio coverage:      {np.mean(coverages):.1%}")
+    print(f"mean CPU per session:     {np.mean(cpu) * 1e3:.1f} ms")
+    print(f"mean CPU per audio second: {np.sum(cpu) / np.sum(audio) * 1e3:.2f} ms")
+    print(f"wall time (incl. synthesis): {time.perf_counter() - started:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
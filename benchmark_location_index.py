@@ -0,0 +1,64 @@
+import timeit
+
+from location_index import AREA_FACETS, LocationIndex, load_location_data, normalize_facet
+
+# Area filters an issue router would typically ask for
+QUERIES = [
+    {"deck": "Deck 10", "zone": "FWD", "fire_zone": "FZ6"},
+    {"deck": "Deck 8", "zone": "MID"},
+    {"fire_zone": "FZ4"},
+    {"deck": "Deck 9", "transverse": "PS", "zone": "AFT", "fire_zone": "FZ2"},
+]
+CABINS = ["10000", "11542", "9999", "Bridge"]
+
+
+def linear_query(locations, **criteria):
+    criteria = {facet: normalize_facet(facet, value) for facet, value in criteria.items()}
+    result = set()
+    for loc in locations:
+        for area in loc.get("locationAreas") or []:
+            if all(normalize_facet(facet, area.get(AREA_FACETS[facet])) == value for facet, value in criteria.items()):
+                result.add(loc.get("locationId"))
+                break
+    return result
+
+
+def linear_resolve(locations, desc):
+    for loc in locations:
+        if loc.get("locationDesc", "").lower() == desc.lower():
+            return loc.get("locationId")
+    return None
+
+
+def bench(label, func, number):
+    seconds = timeit.timeit(func, number=number)
+    per_call_us = seconds / number * 1e6
+    print(f"{label:<48} {per_call_us:>10.2f} us/call")
+    return per_call_us
+
+
+def main(number=2000):
+    location_data = load_location_data()
+    build_s = timeit.timeit(lambda: LocationIndex(location_data), number=20) / 20
+    index = LocationIndex(location_data)
+    print(f"Locations indexed: {len(index)}  (build: {build_s * 1e3:.2f} ms)\n")
+
+    for criteria in QUERIES:
+        assert index.query_ids(**criteria) == linear_query(location_data, **criteria)
+        label = ", ".join(f"{k}={v}" for k, v in criteria.items())
+        print(f"{label}  ->  {len(index.query_ids(**criteria))} locations")
+        linear = bench("  linear scan", lambda: linear_query(location_data, **criteria), number // 10)
+        indexed = bench("  LocationIndex.query_ids", lambda: index.query_ids(**criteria), number)
+        print(f"  speedup: {linear / indexed:.1f}x\n")
+
+    for desc in CABINS:
+        resolved = index.resolve(desc)
+        assert (resolved or {}).get("locationId") == linear_resolve(location_data, desc)
+        print(f"resolve {desc!r}  ->  {(resolved or {}).get('locationId')}")
+        linear = bench("  linear scan", lambda: linear_resolve(location_data, desc), number // 10)
+        indexed = bench("  LocationIndex.resolve", lambda: index.resolve(desc), number)
+        print(f"  speedup: {linear / indexed:.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
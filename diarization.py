@@ -0,0 +1,213 @@
+import time
+import numpy as np
+
+RATE = 16000
+SAMPLE_WIDTH = 2
+FRAME_SIZE = 400   # 25 ms
+HOP_SIZE = 160     # 10 ms
+N_FFT = 1024       # zero-padded so the autocorrelation used for pitch does not wrap
+N_MELS = 24
+N_CEPS = 12
+MIN_PITCH_HZ = 60
+MAX_PITCH_HZ = 400
+
+OFFICER = "Guest Services Officer"
+GUEST = "Guest"
+
+
+def _mel_filterbank(n_mels=N_MELS, n_fft=N_FFT, rate=RATE, f_min=80.0, f_max=7600.0):
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+    mel_points = np.linspace(hz_to_mel(f_min), hz_to_mel(f_max), n_mels + 2)
+    bins = np.floor((n_fft + 1) * mel_to_hz(mel_points) / rate).astype(int)
+
+    fbank = np.zeros((n_mels, n_fft // 2 + 1))
+    for m in range(1, n_mels + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            fbank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            fbank[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return fbank
+
+
+def _dct_matrix(n_out=N_CEPS + 1, n_in=N_MELS):
+    n = np.arange(n_in)
+    k = np.arange(n_out)[:, None]
+    return np.cos(np.pi * k * (2 * n + 1) / (2 * n_in))
+
+
+MEL_FILTERBANK = _mel_filterbank()
+DCT_MATRIX = _dct_matrix()
+WINDOW = np.hanning(FRAME_SIZE)
+
+
+def pcm_to_float(pcm_bytes):
+    """Convert 16-bit little-endian mono PCM bytes to float samples in [-1, 1]."""
+    usable = len(pcm_bytes) - len(pcm_bytes) % SAMPLE_WIDTH
+    return np.frombuffer(pcm_bytes[:usable], dtype="<i2").astype(np.float32) / 32768.0
+
+
+def speaker_embedding(samples, rate=RATE):
+    """
+    Return a fixed-size voice embedding for a stretch of audio, or None if it holds no speech.
+
+    The embedding is the mean cepstrum of the voiced frames (spectral envelope) followed
+    by the median log pitch, both computed from a single FFT per frame.
+    """
+    if len(samples) < FRAME_SIZE:
+        return None
+
+    n_frames = 1 + (len(samples) - FRAME_SIZE) // HOP_SIZE
+    idx = np.arange(FRAME_SIZE)[None, :] + HOP_SIZE * np.arange(n_frames)[:, None]
+    frames = samples[idx] * WINDOW
+
+    power = np.abs(np.fft.rfft(frames, n=N_FFT)) ** 2
+    energy = power.sum(axis=1)
+    log_energy = 10.0 * np.log10(energy + 1e-10)
+
+    # Keep frames within 30 dB of the loudest one, ignoring near-silence
+    voiced = (log_energy > log_energy.max() - 30.0) & (log_energy > -60.0)
+    if voiced.sum() < 5:
+        return None
+    power = power[voiced]
+
+    log_mel = np.log(power @ MEL_FILTERBANK.T + 1e-10)
+    cepstrum = log_mel @ DCT_MATRIX.T
+    ceps_mean = cepstrum[:, 1:].mean(axis=0)
+
+    # Autocorrelation via the inverse FFT of the power spectrum
+    autocorr = np.fft.irfft(power, n=N_FFT)
+    min_lag, max_lag = rate // MAX_PITCH_HZ, rate // MIN_PITCH_HZ
+    lags = autocorr[:, min_lag:max_lag].argmax(axis=1) + min_lag
+    periodic = autocorr[np.arange(len(lags)), lags] > 0.3 * autocorr[:, 0]
+    if periodic.any():
+        log_pitch = np.log2(rate / np.median(lags[periodic]))
+    else:
+        log_pitch = np.log2(rate / max_lag)
+
+    return np.append(ceps_mean, log_pitch)
+
+
+class SpeakerDiarizer:
+    """
+    Online two-speaker diarization for one call, running on the buffered PCM audio.
+
+    Each Whisper segment is turned into a voice embedding and assigned to the closer of
+    two running centroids. The first voice heard is taken to be the Guest Services
+    Officer answering the call; the guest centroid is opened by the first segment that
+    is further than `new_speaker_threshold` from the officer.
+    """
+
+    # Default weights and threshold were tuned on the synthetic voices in
+    # benchmark_diarization.py only; they have not been validated on real calls
+    def __init__(self, rate=RATE, new_speaker_threshold=7.0, cepstral_weight=0.25, pitch_weight=20.0, min_update_weight=0.1):
+        self.rate = rate
+        self.new_speaker_threshold = new_speaker_threshold
+        self.cepstral_weight = cepstral_weight
+        self.pitch_weight = pitch_weight
+        self.min_update_weight = min_update_weight
+        self.centroids = {}
+        self.counts = {OFFICER: 0, GUEST: 0}
+        self.last_speaker = OFFICER
+        self.audio_seconds = 0.0
+        self.cpu_seconds = 0.0
+
+    def _scaled(self, embedding):
+        scaled = embedding * self.cepstral_weight
+        scaled[-1] = embedding[-1] * self.pitch_weight
+        return scaled
+
+    def _assign(self, embedding):
+        if embedding is None:
+            # Too short or silent to tell; assume the current speaker kept talking
+            return self.last_speaker
+
+        embedding = self._scaled(embedding)
+        if OFFICER not in self.centroids:
+            speaker = OFFICER
+        elif GUEST not in self.centroids:
+            distance = np.linalg.norm(embedding - self.centroids[OFFICER])
+            speaker = GUEST if distance > self.new_speaker_threshold else OFFICER
+        else:
+            speaker = min(self.centroids, key=lambda s: np.linalg.norm(embedding - self.centroids[s]))
+
+        # Running mean that never stops adapting entirely
+        self.counts[speaker] += 1
+        weight = max(1.0 / self.counts[speaker], self.min_update_weight)
+        if speaker in self.centroids:
+            self.centroids[speaker] += weight * (embedding - self.centroids[speaker])
+        else:
+            self.centroids[speaker] = embedding
+        return speaker
+
+    def label_segments(self, pcm_bytes, segments):
+        """
+        Label Whisper segments whose start/end times (seconds) are relative to `pcm_bytes`.
+
+        Returns a list of {"speaker", "start", "end", "text"} dicts in segment order.
+        """
+        started = time.process_time()
+        samples = pcm_to_float(pcm_bytes)
+        labeled = []
+
+        for seg in segments:
+            start = max(int(seg.get("start", 0) * self.rate), 0)
+            end = min(int(seg.get("end", 0) * self.rate), len(samples))
+            embedding = speaker_embedding(samples[start:end], self.rate) if end > start else None
+            speaker = self._assign(embedding)
+            self.last_speaker = speaker
+            self.audio_seconds += max(end - start, 0) / self.rate
+            labeled.append({
+                "speaker": speaker,
+                "start": seg.get("start"),
+                "end": seg.get("end"),
+                "text": seg.get("text", "").strip(),
+            })
+
+        self.cpu_seconds += time.process_time() - started
+        return labeled
+
+    def stats(self):
+        return {
+            "audioSeconds": round(self.audio_seconds, 2),
+            "cpuSeconds": round(self.cpu_seconds, 4),
+            "realTimeFactor": round(self.cpu_seconds / self.audio_seconds, 5) if self.audio_seconds else None,
+        }
+
+
+def new_segments_since(previous_segments, current_segments, stride_sec):
+    """
+    Return the parts of the current segments not already covered by the previous batch.
+
+    Whisper timestamps are relative to each window, so the previous batch's last end
+    is shifted back by the window stride onto the current window's clock. Segments that
+    straddle that point are kept with their start clipped to it, so long segments
+    spanning the overlap are not lost.
+    """
+    if not previous_segments:
+        return current_segments
+
+    last_prev_end = previous_segments[-1].get("end", 0) - stride_sec
+    return [
+        dict(seg, start=max(seg.get("start", 0), last_prev_end))
+        for seg in current_segments
+        if seg.get("end", 0) > last_prev_end
+    ]
+
+
+def format_labeled_transcript(labeled_segments):
+    """Join labeled segments into "Speaker: text" lines, merging consecutive turns."""
+    lines = []
+    for seg in labeled_segments:
+        if not seg["text"]:
+            continue
+        if lines and lines[-1][0] == seg["speaker"]:
+            lines[-1][1].append(seg["text"])
+        else:
+            lines.append((seg["speaker"], [seg["text"]]))
+    return "\n".join(f"{speaker}: {' '.join(texts)}" for speaker, texts in lines)
@@ -3,6 +3,7 @@ import os
 import re
 from datetime import datetime
 from openai import OpenAI
+from diarization import SpeakerDiarizer, format_labeled_transcript
 
 # Initialize OpenAI client
 api_key_s=os.getenv("OPENAI_API_KEY")
@@ -198,31 +199,34 @@ def check_issue_match(transcript):
             "Compensation": None
         }
 
-def speaker_diarization(transcript):
-    prompt_diarization = (
-        f"Given the transcript text: '{transcript}', add speaker diarization to the transcript. The conversation is taking place between a Guest State officer (name might be provided in the transcript) and a guest (name might be provided in the transcript)"
-    )
-
+def speaker_diarization(diarizer, audio_bytes, segments):
+    # Label segments of the window audio as officer or guest, locally
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You identify speakers in transcript."},
-                {"role": "user", "content": prompt_diarization}
-            ]
-        )
-
-        diarization_text = response.choices[0].message.content.strip()
-        # print("Diarization Text:", diarization_text)
-        return diarization_text
+        return diarizer.label_segments(audio_bytes, segments)
 
     except Exception as e:
         print(f"[speaker_diarization] Error: {e}")
-        return transcript
+        # Keep every segment so the labels stay in step with the transcript text
+        return [
+            {
+                "speaker": diarizer.last_speaker,
+                "start": seg.get("start"),
+                "end": seg.get("end"),
+                "text": seg.get("text", "").strip()
+            }
+            for seg in segments
+        ]
 
-def process_transcript(transcript):
+def process_transcript(transcript, audio_bytes=None, segments=None, diarizer=None):
     original_transcript = transcript
-    labeled_transcript = speaker_diarization(transcript)
+    # Speakers are told apart from the call audio, so labeling needs the PCM and
+    # the Whisper segments it was transcribed from
+    if audio_bytes and segments:
+        labeled_segments = speaker_diarization(diarizer or SpeakerDiarizer(), audio_bytes, segments)
+        labeled_transcript = format_labeled_transcript(labeled_segments)
+    else:
+        print("[process_transcript] No audio/segments given; transcript is not speaker-labeled")
+        labeled_transcript = transcript
 
     entry = {
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -0,0 +1,132 @@
+import json
+import os
+from collections import defaultdict
+from itertools import combinations
+
+# Facets of a locationArea that can be queried, mapped to their Location.json key
+AREA_FACETS = {
+    "deck": "deckDesc",
+    "transverse": "transverseDesc",
+    "zone": "zoneDesc",
+    "fire_zone": "fireZoneDesc",
+}
+
+
+def normalize_facet(facet, value):
+    if value is None:
+        return None
+    value = str(value).strip().lower()
+    # Allow deck=10 / deck="10" as shorthand for "Deck 10"
+    if facet == "deck" and value.isdigit():
+        value = f"deck {value}"
+    return value
+
+
+def load_location_data():
+    if os.path.exists("Location.json"):
+        with open("Location.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    return []
+
+
+class LocationIndex:
+    """
+    In-memory multi-key index over Location.json, built once at startup.
+
+    Resolves a cabin number or public area description to its locationId and
+    locationAreas, and answers area queries such as deck="Deck 10", zone="FWD",
+    fire_zone="FZ6" without scanning the location list.
+    """
+
+    def __init__(self, locations):
+        self.locations = {}
+        self.by_desc = {}
+        self.public_descs = []
+        # Keyed by every combination of an area's facets, e.g.
+        # (("deck", "deck 10"), ("fire_zone", "fz6")), so any query is one lookup
+        self.by_area = defaultdict(set)
+        self.guest_cabins = set()
+        self.crew_cabins = set()
+
+        for loc in locations:
+            location_id = loc.get("locationId")
+            if location_id is None:
+                continue
+            self.locations[location_id] = loc
+
+            desc = (loc.get("locationDesc") or "").strip().lower()
+            if desc:
+                self.by_desc.setdefault(desc, location_id)
+
+            if loc.get("guestCabin"):
+                self.guest_cabins.add(location_id)
+            if loc.get("crewCabin"):
+                self.crew_cabins.add(location_id)
+            if desc and not loc.get("guestCabin") and not loc.get("crewCabin"):
+                self.public_descs.append((desc, location_id))
+
+            for area in loc.get("locationAreas") or []:
+                facets = [
+                    (facet, normalize_facet(facet, area.get(field)))
+                    for facet, field in AREA_FACETS.items()
+                    if area.get(field) is not None
+                ]
+                for size in range(1, len(facets) + 1):
+                    for key in combinations(facets, size):
+                        self.by_area[key].add(location_id)
+
+    def __len__(self):
+        return len(self.locations)
+
+    def _describe(self, location_id):
+        loc = self.locations[location_id]
+        return {
+            "locationId": location_id,
+            "locationDesc": loc.get("locationDesc"),
+            "guestCabin": loc.get("guestCabin", False),
+            "crewCabin": loc.get("crewCabin", False),
+            "locationAreas": loc.get("locationAreas") or [],
+        }
+
+    def get(self, location_id):
+        if location_id not in self.locations:
+            return None
+        return self._describe(location_id)
+
+    def resolve(self, desc):
+        """Resolve a cabin number or area description to its location details, or None."""
+        if desc is None:
+            return None
+        location_id = self.by_desc.get(str(desc).strip().lower())
+        if location_id is None:
+            return None
+        return self._describe(location_id)
+
+    def find_public_area(self, transcript_text):
+        """Return the first public (non-cabin) area whose description appears in the text."""
+        text = transcript_text.lower()
+        for desc, location_id in self.public_descs:
+            if desc in text:
+                return self._describe(location_id)
+        return None
+
+    def query_ids(self, deck=None, transverse=None, zone=None, fire_zone=None, guest_cabin=None, crew_cabin=None):
+        """Return the set of locationIds having an area that matches every given facet."""
+        criteria = {"deck": deck, "transverse": transverse, "zone": zone, "fire_zone": fire_zone}
+        key = tuple(
+            (facet, normalize_facet(facet, value))
+            for facet, value in criteria.items()
+            if value is not None
+        )
+        result = set(self.by_area.get(key, ())) if key else set(self.locations)
+
+        if guest_cabin is not None:
+            result = result & self.guest_cabins if guest_cabin else result - self.guest_cabins
+        if crew_cabin is not None:
+            result = result & self.crew_cabins if crew_cabin else result - self.crew_cabins
+        return result
+
+    def query(self, **criteria):
+        """Same as query_ids, but returns location details sorted by locationId."""
+        return [self._describe(location_id) for location_id in sorted(self.query_ids(**criteria))]
+
@@ -4,34 +4,23 @@ import re
 from datetime import datetime
 from openai import OpenAI
 from rapidfuzz import fuzz
+from location_index import LocationIndex, load_location_data
 # Initialize OpenAI client
 api_key = os.getenv("OPENAI_API_KEY")
 client = OpenAI(api_key=api_key)
 
 ISSUE_DATA_FILE = "issue_data.json"
 
-def load_location_data():
-    if os.path.exists("Location.json"):
-        with open("Location.json", "r", encoding="utf-8") as f:
-            return json.load(f)
-    return []
-
 location_data = load_location_data()
+location_index = LocationIndex(location_data)
 
 
-async def match_location_to_desc(transcript_text):
-    for loc in location_data:
-        # Skip entries that are guest or crew cabins
-        if loc.get("guestCabin") or loc.get("crewCabin"):
-            continue
-
-        desc = loc.get("locationDesc", "").lower()
-        if desc and desc in transcript_text.lower():
-            # Return locationDesc 
-            return loc.get("locationDesc")
-    
-    # No location matched
-    return None
+async def resolve_location(transcript_text, cabin=None):
+    # Prefer a public area named in the transcript, then the guest's cabin
+    matched = location_index.find_public_area(transcript_text)
+    if not matched and cabin:
+        matched = location_index.resolve(cabin)
+    return matched
 
 
 def load_guest_data():
@@ -172,31 +161,26 @@ Now analyze the following transcript:
 
 
 
-async def speaker_diarization(transcript):
-    prompt_diarization = (
-        f"Given the transcript text: '{transcript}', add speaker diarization to the transcript. The conversation is taking place between a Guest State officer (name might be provided in the transcript) and a guest (name might be provided in the transcript)"
-    )
-
+async def speaker_diarization(diarizer, audio_bytes, segments):
+    # Label segments of the window audio as officer or guest, locally
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You identify speakers in transcript."},
-                {"role": "user", "content": prompt_diarization}
-            ]
-        )
-
-        diarization_text = response.choices[0].message.content.strip()
-        # print("Diarization Text:", diarization_text)
-        return diarization_text
+        return diarizer.label_segments(audio_bytes, segments)
 
     except Exception as e:
         print(f"[speaker_diarization] Error: {e}")
-        return transcript
+        # Keep every segment so the labels stay in step with the transcript text
+        return [
+            {
+                "speaker": diarizer.last_speaker,
+                "start": seg.get("start"),
+                "end": seg.get("end"),
+                "text": seg.get("text", "").strip()
+            }
+            for seg in segments
+        ]
 
 async def process_transcript(transcript):
     original_transcript = transcript
-    # labeled_transcript = await(speaker_diarization(transcript))
 
     issues_dict = {
         issue["issueTypeDesc"].strip().lower(): {
@@ -213,10 +197,7 @@ async def process_transcript(transcript):
     issue_type = analysis.get("issueTypeDesc", "").strip().lower() if analysis.get("issueTypeDesc") else None
     # print("issue_type----------->",issue_type)
     issue_info = issues_dict.get(issue_type, {}) if issue_type else {}
-    # Use the updated function to get the location description
-    matched_location_desc = await(match_location_to_desc(original_transcript))
-    if not matched_location_desc and analysis.get("cabin"):
-        matched_location_desc = analysis["cabin"]
+    matched_location = await(resolve_location(original_transcript, analysis.get("cabin"))) or {}
     # Guest info logic
     guest_details = {}
     if analysis.get("cabin"):
@@ -234,7 +215,9 @@ async def process_transcript(transcript):
         "level1DepartmentDesc": issue_info.get("level1DepartmentDesc"),
         "cabin": analysis.get("cabin"),
         "guestDetails": guest_details,
-        "locationId": matched_location_desc,
+        "locationId": matched_location.get("locationId"),
+        "locationDesc": matched_location.get("locationDesc"),
+        "locationAreas": matched_location.get("locationAreas"),
         "guestEmotion": analysis.get("emotion"),
         "summary": analysis.get("summary"),
         "compensation": analysis.get("compensation")
@@ -249,22 +232,8 @@ async def convert_non_null_values_to_text(data):
         return [await convert_non_null_values_to_text(item) for item in data]
     else:
         return str(data) if data is not None else None
-def merge_transcriptions_with_timestamps(previous_segments, current_segments):
+def segments_to_text(segments):
     """
-    Merge two segment-based transcripts, trimming the overlap using timestamps.
-    Avoids repeating content from previous segments in the current batch.
+    Join Whisper segment texts into one transcript string.
     """
-    if not previous_segments:
-        return " ".join(seg.get("text", "").strip() for seg in current_segments)
-
-    # Get the last timestamp from previous segment
-    last_prev_end = previous_segments[-1].get("end", 0)
-
-    # Filter current segments: only include those that start *after* last end
-    filtered_current = [seg for seg in current_segments if seg.get("start", 0) >= last_prev_end]
-
-    merged_text = []
-    merged_text.extend(seg.get("text", "").strip() for seg in previous_segments)
-    merged_text.extend(seg.get("text", "").strip() for seg in filtered_current)
-
-    return " ".join(merged_text).strip()
\ No newline at end of file
+    return " ".join(seg.get("text", "").strip() for seg in segments).strip()
\ No newline at end of file
@@ -10,6 +10,7 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from starlette.websockets import WebSocketState
 from fastapi.middleware.cors import CORSMiddleware
 from new_helper import *
+from diarization import SpeakerDiarizer, format_labeled_transcript, new_segments_since
 
 # Constants
 api_key = os.getenv("OPENAI_API_KEY")
@@ -21,6 +22,7 @@ SEGMENT_DURATION_SEC = 6
 OVERLAP_DURATION_SEC = 2
 SEGMENT_SIZE = RATE * SEGMENT_DURATION_SEC * SAMPLE_WIDTH
 OVERLAP_SIZE = RATE * OVERLAP_DURATION_SEC * SAMPLE_WIDTH
+STRIDE_SEC = SEGMENT_DURATION_SEC - OVERLAP_DURATION_SEC
 MAX_BUFFER_SIZE = RATE * 30 * SAMPLE_WIDTH  # 30 seconds max buffer
 
 client_histories = {}
@@ -46,6 +48,8 @@ async def websocket_audio(websocket: WebSocket):
     client_id = id(websocket)
     client_histories[client_id] = []
     previous_segments = []
+    diarizer = SpeakerDiarizer(rate=RATE)
+    labeled_segments = []
 
     try:
         while True:
@@ -79,12 +83,14 @@ async def websocket_audio(websocket: WebSocket):
                     continue
 
                 if transcription_result:
-                    current_text = transcription_result.get("text", "")
                     current_segments = transcription_result.get("segments", [])
 
                     try:
-                        if previous_segments:
-                            current_text = merge_transcriptions_with_timestamps(previous_segments, current_segments)
+                        # History text and speaker labels are both built from the
+                        # segments not already seen in the overlap
+                        new_segments = new_segments_since(previous_segments, current_segments, STRIDE_SEC)
+                        labeled_segments.extend(await speaker_diarization(diarizer, segment, new_segments))
+                        current_text = segments_to_text(new_segments)
 
                         print("📝 TRANSCRIPTION:", current_text)
 
@@ -92,6 +98,7 @@ async def websocket_audio(websocket: WebSocket):
                         full_history = " ".join(client_histories[client_id])
 
                         result_json = await process_transcript(full_history)
+                        result_json["labeledTranscript"] = format_labeled_transcript(labeled_segments)
                         result_json = await convert_non_null_values_to_text(result_json)
 
                         if websocket.client_state == WebSocketState.CONNECTED:
@@ -123,6 +130,7 @@ async def websocket_audio(websocket: WebSocket):
 
     finally:
         client_histories.pop(client_id, None)
+        print(f"🗣️ Diarization cost: {diarizer.stats()}")
         print("🧹 Cleaned up client history")
 
 